@@ -84,6 +84,41 @@ class ScrollableEntry(ttk.Entry):
         self.variable.set(str(new_value if not self.is_int else int(new_value)))
         return "break"
 
+SAMPLE_DTYPE = np.float32 # Dtype for rendered waves and the audio mix
+BUFFER_SHRINK_FACTOR = 4 # Pooled buffers this many times larger than needed are released
+
+
+class BufferPool:
+    # Reusable numpy arrays by name; a backing array is reallocated when too small or BUFFER_SHRINK_FACTOR x too big
+    def __init__(self):
+        self._buffers = {}
+        self._ramp = np.arange(0, dtype=np.float64)
+
+    def get(self, name, shape, dtype=SAMPLE_DTYPE):
+        size = int(np.prod(shape))
+        buf = self._buffers.get(name)
+        if buf is None or buf.dtype != dtype or buf.size < size or buf.size > size * BUFFER_SHRINK_FACTOR:
+            buf = np.empty(size, dtype=dtype)
+            self._buffers[name] = buf
+        return buf[:size].reshape(shape)
+
+    def ramp(self, n):
+        # 0..n-1 sample index ramp, used to build time axes without np.linspace
+        ramp = self._ramp
+        if ramp.size < n or ramp.size > n * BUFFER_SHRINK_FACTOR:
+            ramp = self._ramp = np.arange(n, dtype=np.float64)
+        return ramp[:n]
+
+
+def render_sine(out, ramp, dt, freq, amp, phase, scratch):
+    # amp * sin(2*pi*freq*ramp*dt + phase) into out; the angle is built in float64 scratch for phase accuracy
+    np.multiply(ramp, 2 * np.pi * freq * dt, out=scratch)
+    scratch += phase
+    np.sin(scratch, out=out)
+    out *= amp
+    return out
+
+
 class SineWaveComparator:
     def __init__(self, master):
         self.master = master
@@ -93,6 +128,10 @@ class SineWaveComparator:
 
         self.sine_waves = []
         self.next_color_index = 0
+        self.buffers = BufferPool()
+        self.audio_buffers = BufferPool() # Separate pool so the audio thread never touches plot buffers
+        self.x_data = None
+        self.y_matrix = None # (waves x samples) SAMPLE_DTYPE view, row i belongs to self.sine_waves[i]
         self.A4_FREQ = 440.0
 
         # --- TTK Styling ---
@@ -349,7 +388,7 @@ class SineWaveComparator:
         
         wave_data = {'id': wave_id, 'frame': wave_frame, 'freq_var': freq_var,
                      'amp_var': amp_var, 'phase_var': phase_var, 'color': color,
-                     'y_data': None, 'note_name': note_name, 
+                     'note_name': note_name, 
                      'base_freq_for_display': initial_freq} # Store original freq for display if needed
         self.sine_waves.append(wave_data)
         
@@ -374,7 +413,6 @@ class SineWaveComparator:
 
 
     def update_plot_explicitly(self):
-        # ... (update_plot_explicitly remains largely the same, num_points already increased) ...
         if not self.master.winfo_exists(): return
 
         if not self.sine_waves:
@@ -404,19 +442,29 @@ class SineWaveComparator:
             num_points = max(500, int(distance * 20000))
         if num_points <= 1: num_points = 2 
 
-        self.x_data = np.linspace(self.current_plot_start_time, self.current_plot_end_time, num_points, endpoint=False)
         self.ax.clear()
         max_amp_sum = 0
 
-        for wave in self.sine_waves:
+        # Time axis stays float64 (start points up to 1000s need the precision); waves are float32 rows
+        dt = distance / num_points
+        ramp = self.buffers.ramp(num_points)
+        self.x_data = self.buffers.get('plot_x', (num_points,), np.float64)
+        np.multiply(ramp, dt, out=self.x_data)
+        self.x_data += self.current_plot_start_time
+        self.y_matrix = self.buffers.get('plot_waves', (len(self.sine_waves), num_points))
+        scratch = self.buffers.get('plot_scratch', (num_points,), np.float64)
+
+        for wave_idx, wave in enumerate(self.sine_waves):
             try:
                 freq = float(wave['freq_var'].get())
                 if freq <=0: freq = 0.01 
             except ValueError: freq = 1.0 
             amp = wave['amp_var'].get()
             phase = wave['phase_var'].get() 
-            wave['y_data'] = amp * np.sin(2 * np.pi * freq * self.x_data + phase)
-            self.ax.plot(self.x_data, wave['y_data'], color=wave['color'], linewidth=1.5) 
+            # Fold the start time into the phase (mod one cycle) so the angle ramp starts near zero
+            start_phase = 2 * np.pi * ((freq * self.current_plot_start_time) % 1.0) + phase
+            y_row = render_sine(self.y_matrix[wave_idx], ramp, dt, freq, amp, start_phase, scratch)
+            self.ax.plot(self.x_data, y_row, color=wave['color'], linewidth=1.5) 
             max_amp_sum += amp
         
         current_max_amp = max(1.0, max_amp_sum if max_amp_sum > 0 else 1.0)
@@ -459,88 +507,68 @@ class SineWaveComparator:
         if amplitude_tolerance < 1e-9 : amplitude_tolerance = 1e-9 # Ensure a minimum tolerance
 
 
-        all_individual_crossings = [] # List of (time, wave_index)
-
-        for wave_idx, wave in enumerate(self.sine_waves):
-            if wave['y_data'] is None or len(wave['y_data']) < 2:
-                continue
-            
-            y_values = wave['y_data']
-            x_times = self.x_data
-            
-            # Find where product of adjacent y_values is non-positive (means sign change or one is zero)
-            cross_indices = np.where(y_values[:-1] * y_values[1:] <= 0)[0]
-
-            for idx in cross_indices:
-                y1, y2 = y_values[idx], y_values[idx+1]
-                x1, x2 = x_times[idx], x_times[idx+1]
-
-                # Perform linear interpolation to find the crossing time
-                # x_cross = x1 - y1 * (x2 - x1) / (y2 - y1)
-                if abs(y2 - y1) > 1e-9: # Avoid division by zero if y1 and y2 are almost equal
-                    t_cross = x1 - y1 * (x2 - x1) / (y2 - y1)
-                elif abs(y1) < amplitude_tolerance : # y1 is already at/near zero
-                    t_cross = x1
-                elif abs(y2) < amplitude_tolerance : # y2 is at/near zero
-                    t_cross = x2
-                else: # Both y1, y2 are same and non-zero, but y1*y2<=0 means both are effectively zero
-                      # This case should ideally be caught by abs(y1) < tol, but as a fallback:
-                    t_cross = (x1 + x2) / 2.0 
-
-                # Ensure the crossing is within the current plot view and that its amplitude is indeed near zero
-                # The interpolation itself finds where it *would* be zero.
-                # The amplitude_tolerance check is more about how "flat" a crossing is allowed to be.
-                # For now, we trust the sign change and interpolation.
-                if plot_start_time <= t_cross <= plot_end_time:
-                    # Check if one of the points defining the crossing is within amplitude_tolerance of zero
-                    # This helps filter out crossings that are numerically found but might be very "shallow"
-                    # if the amplitude_tolerance is very small. The primary check is the sign change.
-                    # if abs(y1) < amplitude_tolerance or abs(y2) < amplitude_tolerance or abs(y1*y2) < 1e-9: # one point is close or product is zero
-                    all_individual_crossings.append((t_cross, wave_idx))
-
-
-        if not all_individual_crossings:
+        y_matrix = self.y_matrix
+        if y_matrix is None or y_matrix.shape != (len(self.sine_waves), len(self.x_data)):
+            return
+        x_times = self.x_data
+        num_waves, num_points = y_matrix.shape
+
+        # Find where product of adjacent y_values is non-positive (means sign change or one is zero),
+        # for every wave at once, reusing the product and mask buffers between redraws
+        products = self.buffers.get('zc_products', (num_waves, num_points - 1))
+        np.multiply(y_matrix[:, :-1], y_matrix[:, 1:], out=products)
+        cross_mask = self.buffers.get('zc_mask', (num_waves, num_points - 1), np.bool_)
+        np.less_equal(products, 0, out=cross_mask)
+        wave_indices, cross_indices = np.nonzero(cross_mask)
+        if len(cross_indices) == 0:
             return
 
-        all_individual_crossings.sort() # Sort by time, crucial for grouping
-
-        # Group sorted crossings
-        final_groups = []
-        if not all_individual_crossings: return
-
-        processed_up_to_idx = -1 # To skip already grouped items efficiently
-
-        for i in range(len(all_individual_crossings)):
-            if i <= processed_up_to_idx:
-                continue
+        y1 = y_matrix[wave_indices, cross_indices].astype(np.float64)
+        y2 = y_matrix[wave_indices, cross_indices + 1].astype(np.float64)
+        x1 = x_times[cross_indices]
+        x2 = x_times[cross_indices + 1]
+
+        # Perform linear interpolation to find the crossing time
+        # x_cross = x1 - y1 * (x2 - x1) / (y2 - y1)
+        dy = y2 - y1
+        can_interpolate = np.abs(dy) > 1e-9 # Avoid division by zero if y1 and y2 are almost equal
+        interpolated = x1 - y1 * (x2 - x1) / np.where(can_interpolate, dy, 1.0)
+        # Otherwise take whichever point is at/near zero, falling back to the midpoint
+        near_zero = np.where(np.abs(y1) < amplitude_tolerance, x1,
+                             np.where(np.abs(y2) < amplitude_tolerance, x2, (x1 + x2) / 2.0))
+        crossing_times = np.where(can_interpolate, interpolated, near_zero)
+
+        # Ensure the crossing is within the current plot view
+        in_view = (crossing_times >= plot_start_time) & (crossing_times <= plot_end_time)
+        crossing_times = crossing_times[in_view]
+        crossing_waves = wave_indices[in_view]
+        if len(crossing_times) == 0:
+            return
 
-            group_candidate = [all_individual_crossings[i]]
-            group_start_time = all_individual_crossings[i][0]
-            
-            current_max_idx_in_this_group = i
+        # Sort by time (then wave index), crucial for grouping
+        order = np.lexsort((crossing_waves, crossing_times))
+        crossing_times = crossing_times[order]
+        crossing_waves = crossing_waves[order]
 
-            for j in range(i + 1, len(all_individual_crossings)):
-                next_crossing_time = all_individual_crossings[j][0]
-                
-                if (next_crossing_time - group_start_time) <= time_grouping_tolerance:
-                    group_candidate.append(all_individual_crossings[j])
-                    current_max_idx_in_this_group = j
-                else:
-                    # This crossing is too far to be part of the current group started at group_start_time.
-                    break 
-            
-            final_groups.append(group_candidate)
-            processed_up_to_idx = current_max_idx_in_this_group
+        # Group sorted crossings: each group takes every crossing within time_grouping_tolerance
+        # of its first one, and the next group starts at the first crossing left over
+        final_groups = [] # List of (start, end) slices into crossing_times / crossing_waves
+        group_start = 0
+        while group_start < len(crossing_times):
+            group_end = int(np.searchsorted(crossing_times, crossing_times[group_start] + time_grouping_tolerance, side='right'))
+            group_end = max(group_end, group_start + 1)
+            final_groups.append((group_start, group_end))
+            group_start = group_end
 
 
         # Plot bars for groups with >= 2 unique waves
         plotted_bar_avg_times = set() # To prevent overplotting nearly identical group averages
 
-        for group in final_groups:
-            unique_waves_in_group = set(wave_idx for _, wave_idx in group)
+        for group_start, group_end in final_groups:
+            unique_waves_in_group = set(crossing_waves[group_start:group_end].tolist())
 
             if len(unique_waves_in_group) >= 2: # Condition: At least two different waves
-                avg_time = np.mean([t for t, _ in group])
+                avg_time = float(crossing_times[group_start:group_end].mean())
                 
                 # Check if a bar for a very similar group average time has already been plotted
                 is_too_close_to_plotted = False
@@ -593,10 +621,14 @@ class SineWaveComparator:
         self.audio_thread.start()
 
     def _generate_and_play_audio(self):
-        # ... (_generate_and_play_audio remains the same) ...
         duration_s = 3.0
-        t_audio = np.linspace(0, duration_s, int(self.sample_rate * duration_s), False)
-        combined_wave = np.zeros_like(t_audio)
+        num_samples = int(self.sample_rate * duration_s)
+        ramp = self.audio_buffers.ramp(num_samples)
+        # Mix straight into a float32 buffer so blocks can go to the stream without conversion
+        combined_wave = self.audio_buffers.get('audio_mix', (num_samples,))
+        combined_wave.fill(0.0)
+        wave_buffer = self.audio_buffers.get('audio_wave', (num_samples,))
+        scratch = self.audio_buffers.get('audio_scratch', (num_samples,), np.float64)
         active_waves_for_audio = 0
         for wave_data in self.sine_waves:
             try:
@@ -605,12 +637,12 @@ class SineWaveComparator:
             except ValueError: continue 
             amp = wave_data['amp_var'].get()
             phase = wave_data['phase_var'].get()
-            combined_wave += amp * np.sin(2 * np.pi * freq * t_audio + phase)
+            combined_wave += render_sine(wave_buffer, ramp, 1.0 / self.sample_rate, freq, amp, phase, scratch)
             active_waves_for_audio +=1
         if active_waves_for_audio == 0:
             if hasattr(self.master, 'call'): self.master.after(0, self._reset_play_button)
             return
-        max_abs_val = np.max(np.abs(combined_wave))
+        max_abs_val = max(float(combined_wave.max()), -float(combined_wave.min()))
         if max_abs_val > 1.0: combined_wave /= max_abs_val
         elif max_abs_val == 0 and active_waves_for_audio > 0:
              print("Waves destructively interfered to silence.")
@@ -624,7 +656,7 @@ class SineWaveComparator:
                 if self.stop_audio_flag: break
                 start = i * block_size
                 end = min(start + block_size, len(combined_wave))
-                if start < end: stream.write(combined_wave[start:end].astype(np.float32))
+                if start < end: stream.write(combined_wave[start:end])
         except Exception as e: print(f"Error during audio playback: {e}")
         finally:
             if stream: